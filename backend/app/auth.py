@@ -17,10 +17,44 @@ _JWT_SECRET = os.getenv("JWT_SECRET", "dev-only-secret")
 # Hashing algorithm enforced for JWTs
 _ALG = "HS256"
 
+# Per‑request constants built once: algorithm allow‑list and secret as bytes
+# (PyJWT would otherwise re‑encode the str key on every call)
+_ALGS = (_ALG,)
+_SECRET_BYTES = _JWT_SECRET.encode("utf-8")
+
+# Single re‑usable decoder instance
+_DECODER = jwt.PyJWT()
+
 # Re‑usable HTTPBearer instance (auto_error=False ⇒ endpoint can be public)
 _scheme = HTTPBearer(auto_error=False)
 
 
+# Literal user ID for requests without an Authorization header
+ANONYMOUS = "anonymous"
+
+
+# --------------------------------------------------------------------------- 
+# Helper that verifies a bearer token and returns its `sub` claim
+# --------------------------------------------------------------------------- 
+def _verified_sub(tok: str) -> str | None:
+    """
+    Return the `sub` claim of a valid JWT, or None for a malformed, expired
+    or otherwise invalid token.
+    """
+
+    # Cheap structural check: a JWS compact token is exactly three
+    # dot‑separated segments – reject anything else without entering PyJWT
+    if tok.count(".") != 2:
+        return None
+
+    try:
+        # Decode and verify the JWT
+        payload = _DECODER.decode(tok, _SECRET_BYTES, algorithms=_ALGS)
+        return payload["sub"]
+    except (jwt.PyJWTError, KeyError):
+        return None
+
+
 # --------------------------------------------------------------------------- 
 # Dependency that extracts the user ID from the Authorization header
 # --------------------------------------------------------------------------- 
@@ -30,19 +64,21 @@ def get_current_user(
     """
     Return the `sub` claim of a valid JWT or the literal string "anonymous"
     when the request is unauthenticated.
+
+    A token that is present but invalid or expired is rejected with 401 so
+    the client knows to re‑authenticate instead of silently acting as
+    "anonymous".
     """
 
     # No Authorization header ⇒ unauthenticated request
     if not creds:
-        return "anonymous"
+        return ANONYMOUS
 
-    try:
-        # Decode and verify the JWT   
-        payload = jwt.decode(creds.credentials, _JWT_SECRET, algorithms=[_ALG])
-        return payload["sub"]
-    except (jwt.PyJWTError, KeyError):
-        # Any decode error ⇒ treat as unauthenticated/invalid token
+    sub = _verified_sub(creds.credentials)
+    if sub is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
         )
+    return sub
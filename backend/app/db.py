@@ -2,6 +2,7 @@
 
 # Third‑party imports
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import WriteConcern
 from functools import lru_cache
 import os
 
@@ -18,7 +19,24 @@ def get_client() -> AsyncIOMotorClient:
 
     # Build the connection URI (override via env for prod / CI)
     uri = os.getenv("MONGO_URI", "mongodb://localhost:27017/pcb")
-    return AsyncIOMotorClient(uri)
+
+    # Pool sized for many short requests arriving in bursts:
+    #   • maxConnecting=10 – the driver default (2) funnels a burst of
+    #     concurrent uploads through two connection handshakes at a time
+    #   • minPoolSize=5 – keep a few sockets warm so the first requests after
+    #     an idle period skip the TCP/TLS handshake
+    #   • maxPoolSize=50 – bound per‑process connections (× workers) well
+    #     below the server's limit
+    #   • short selection / wait‑queue timeouts – fail fast with an error
+    #     instead of letting requests pile up when Mongo is unavailable
+    return AsyncIOMotorClient(
+        uri,
+        maxPoolSize=50,
+        minPoolSize=5,
+        maxConnecting=10,
+        serverSelectionTimeoutMS=2000,
+        waitQueueTimeoutMS=1000,
+    )
 
 
 # --------------------------------------------------------------------------- 
@@ -29,3 +47,32 @@ def get_collection():
     Shorthand that yields the `netlists` collection from the `pcb` database.
     """
     return get_client()["pcb"]["netlists"]
+
+
+# ---------------------------------------------------------------------------
+# Same collection, tuned for the upload hot path
+# ---------------------------------------------------------------------------
+def get_ingest_collection():
+    """
+    `netlists` handle with write concern w=1, j=False: the insert is
+    acknowledged by the primary without waiting for the journal fsync.
+    Reads elsewhere keep using `get_collection()` and its defaults.
+    """
+    return get_collection().with_options(write_concern=WriteConcern(w=1, j=False))
+
+
+# ---------------------------------------------------------------------------
+# Indexes required by the list endpoint
+# ---------------------------------------------------------------------------
+async def ensure_indexes() -> None:
+    """
+    Create the `{userId, createdAt desc}` index that backs
+    GET /api/netlists (filter by user, newest first).
+
+    Same keys *and* name as mongo-init/01-indexes.js, so this is a no‑op when
+    the init script already ran.
+    """
+    await get_collection().create_index(
+        [("userId", 1), ("createdAt", -1)],
+        name="user_created_idx",
+    )
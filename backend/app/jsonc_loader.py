@@ -2,20 +2,40 @@
 
 # Standard library / third‑party imports
 from pathlib import Path
-import commentjson  # Parses JSON that may contain //‑style comments
+import re
 
+import orjson  # C JSON parser – much faster than a pure‑Python JSONC parser
 
-# --------------------------------------------------------------------------- 
+
+# ---------------------------------------------------------------------------
+# Tokeniser that finds comments while stepping over string literals
+# ---------------------------------------------------------------------------
+
+# Group 1 captures a complete JSON string (so "http://…" stays intact);
+# the other alternatives match //‑line and /* block */ comments.
+_COMMENT_RE = re.compile(
+    r'("(?:\\.|[^"\\])*")|//[^\n]*|/\*.*?\*/',
+    re.DOTALL,
+)
+
+
+def _keep_strings(match: re.Match) -> str:
+    # Put strings back verbatim, drop comments
+    return match.group(1) or ""
+
+
+# ---------------------------------------------------------------------------
 # Helper that loads "JSON with Comments" (.jsonc) files
-# --------------------------------------------------------------------------- 
+# ---------------------------------------------------------------------------
 def load_jsonc(path: Path) -> dict:
     """
     Parse *path* and return the resulting Python dictionary.
 
-    The function behaves like json.load() but allows C‑/C++ style comments
-    thanks to the `commentjson` parser.
+    The function behaves like json.load() but allows C‑/C++ style comments:
+    they are stripped with a single regex pass and the remainder is parsed
+    by `orjson`.
     """
 
-    # Read file as UTF‑8 and delegate parsing to commentjson
-    with path.open(encoding="utf-8") as fh:
-        return commentjson.load(fh)
+    # Read file as UTF‑8, strip comments, delegate parsing to orjson
+    text = path.read_text(encoding="utf-8")
+    return orjson.loads(_COMMENT_RE.sub(_keep_strings, text))
@@ -7,17 +7,42 @@ Responsibilities:
 
 1. Instantiate the FastAPI application.
 2. Configure CORS so that the React frontend (port 3000) can make
-   cross‑origin requests during local development.
+   cross‑origin requests during local development (API routes only).
 3. Mount the “netlists” router that exposes all API endpoints.
 4. Provide a lightweight /health probe for container orchestrators.
+5. Ensure the MongoDB indexes the API relies on exist at startup.
 """
 
-# Third‑party imports
+# Standard library / third‑party imports
+from contextlib import asynccontextmanager
+import logging
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from pymongo.errors import PyMongoError
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-# Internal routers
+# Internal routers / helpers
 from .netlists import router as netlists_router
+from .db import ensure_indexes
+
+
+# --------------------------------------------------------------------------- 
+# 0) Startup / shutdown hooks
+# --------------------------------------------------------------------------- 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create required indexes once per process before serving requests.
+
+    Mongo may still be booting (the client fails fast), so a failure is
+    logged rather than fatal – mongo-init creates the same index anyway.
+    """
+    try:
+        await ensure_indexes()
+    except PyMongoError as exc:
+        logging.getLogger(__name__).warning("Index creation skipped: %s", exc)
+    yield
 
 
 # --------------------------------------------------------------------------- 
@@ -30,19 +55,41 @@ app = FastAPI(
         "Proof‑of‑concept backend that ingests a JSON netlist, validates it, "
         "stores it in MongoDB, and serves it back to the React frontend."
     ),
+    lifespan=lifespan,
 )
 
 
 # --------------------------------------------------------------------------- 
 # 2) Configure CORS (development‑time only)
 # --------------------------------------------------------------------------- 
+class APICORSMiddleware:
+    """
+    Apply `CORSMiddleware` only to paths under *prefix*.
+
+    Everything else (notably the frequently polled /health) goes straight to
+    the app without CORS header inspection.
+    """
+
+    def __init__(self, app: ASGIApp, prefix: str = "/api/", **cors_options):
+        self.app = app
+        self.prefix = prefix
+        self.cors = CORSMiddleware(app, **cors_options)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"].startswith(self.prefix):
+            await self.cors(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+
 origins = [
     "http://localhost:3000",
     "http://127.0.0.1:3000",
 ]
 
 app.add_middleware(
-    CORSMiddleware,
+    APICORSMiddleware,
+    prefix="/api/",               # Only the API router is called cross‑origin
     allow_origins=origins,        # Which Origin headers to allow
     allow_credentials=True,       # Allow cookies / auth headers
     allow_methods=["*"],          # Allow all HTTP verbs
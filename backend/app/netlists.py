@@ -25,14 +25,17 @@ Supports pagination and simple JWT auth via get_current_user (falls back to
 # ─────────────────────────────────────────────────────────────────────────────
 # Standard library / third‑party imports
 # ─────────────────────────────────────────────────────────────────────────────
-from datetime import datetime
-import json
+import asyncio
+from datetime import datetime, timezone
+from functools import lru_cache
+import hashlib
 import pathlib
 from typing import List, Any
 
 from fastapi import (
     APIRouter,
     Request,
+    Response,
     UploadFile,
     File,
     HTTPException,
@@ -40,37 +43,114 @@ from fastapi import (
     Depends,
     Query,
 )
-from fastapi.responses import JSONResponse
-from fastjsonschema import compile as compile_schema, JsonSchemaException
+from fastapi.responses import ORJSONResponse
+from fastjsonschema import JsonSchemaException
 from bson import ObjectId
+import orjson
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Internal helpers
 # ─────────────────────────────────────────────────────────────────────────────
-from .jsonc_loader import load_jsonc
-from .db import get_collection
+from .db import get_collection, get_ingest_collection
 from .auth import get_current_user
 from . import validators
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# Compile JSON Schema once at import time (fast!)
+# JSON Schema validator – pre‑compiled to source by scripts/build_validator.py
 # ─────────────────────────────────────────────────────────────────────────────
 
-# Build absolute path to `netlist.schema.jsonc`
-schema_path = pathlib.Path(__file__).parent.parent / "schema" / "netlist.schema.jsonc"
+# Plain import: no schema parsing or code generation at startup.  The module
+# is generated at image build time; a checkout that skipped the build step
+# falls back to compiling the schema in‑process.
+try:
+    from ._netlist_validator import validate as validate_netlist
+except ModuleNotFoundError:
+    from fastjsonschema import compile as compile_schema
+    from .jsonc_loader import load_jsonc
+
+    schema_path = (
+        pathlib.Path(__file__).parent.parent / "schema" / "netlist.schema.jsonc"
+    )
+    validate_netlist = compile_schema(load_jsonc(schema_path))
 
-# Parse JSON (with comments) → dict
-schema_dict = load_jsonc(schema_path)
 
-# Generate an ultra‑fast validation function
-validate_netlist = compile_schema(schema_dict)
+# ─────────────────────────────────────────────────────────────────────────────
+# FastAPI router
+# ─────────────────────────────────────────────────────────────────────────────
+# orjson serialises responses straight to bytes (large netlist blobs on GET)
+router = APIRouter(
+    prefix="/api/netlists",
+    tags=["netlists"],
+    default_response_class=ORJSONResponse,
+)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# FastAPI router
+# Cached collection handle (Motor collections are safe to share)
+# ─────────────────────────────────────────────────────────────────────────────
+@lru_cache(maxsize=1)
+def _coll():
+    return get_collection()
+
+
+@lru_cache(maxsize=1)
+def _ingest_coll():
+    return get_ingest_collection()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Render `createdAt` for API responses
+# ─────────────────────────────────────────────────────────────────────────────
+def _iso_utc(value: Any) -> str:
+    """
+    Format a stored BSON date as ISO‑8601 UTC (“…T12:34:56Z”).
+
+    Legacy documents kept `createdAt` as an ISO string; pass those through.
+    """
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return value or ""
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Back‑compat logic that computes a uniform "status" string for list items
+# ─────────────────────────────────────────────────────────────────────────────
+def _list_status(val: Any) -> str:
+    """
+    `val` is the projected `validation.status` field: a dict for the new
+    shape, or a list (one entry per violation) for the legacy shape.
+    """
+    if isinstance(val, dict):
+        return val.get("status", "unknown")
+    if isinstance(val, list):
+        return "invalid" if val else "valid"
+    return "unknown"
+
+
 # ─────────────────────────────────────────────────────────────────────────────
-router = APIRouter(prefix="/api/netlists", tags=["netlists"])
+# Conditional‑request helper for GET /api/netlists/{id}
+# ─────────────────────────────────────────────────────────────────────────────
+def _etag_matches(if_none_match: str, etag: str | None) -> bool:
+    """
+    Evaluate an `If‑None‑Match` header against the stored (unquoted) etag.
+
+    Handles `*`, comma‑separated lists and weak `W/` validators (the weak
+    comparison RFC 9110 prescribes for If‑None‑Match).
+    """
+    if if_none_match.strip() == "*":
+        return True
+    if not etag:
+        return False
+
+    quoted = f'"{etag}"'
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == quoted:
+            return True
+    return False
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -99,8 +179,9 @@ async def upload_netlist(
 
     if content_type.startswith("application/json"):
         try:
-            netlist = await request.json()
-        except Exception as exc:
+            raw = await request.body()
+            netlist = orjson.loads(raw)
+        except orjson.JSONDecodeError as exc:
             raise HTTPException(
                 status.HTTP_400_BAD_REQUEST,
                 f"Invalid JSON body: {exc}",
@@ -109,8 +190,8 @@ async def upload_netlist(
     elif file is not None:
         try:
             raw = await file.read()
-            netlist = json.loads(raw)
-        except json.JSONDecodeError as exc:
+            netlist = orjson.loads(raw)
+        except orjson.JSONDecodeError as exc:
             raise HTTPException(
                 status.HTTP_400_BAD_REQUEST,
                 f"Invalid JSON in uploaded file: {exc.msg}",
@@ -133,28 +214,35 @@ async def upload_netlist(
     # 3) ---------------------------------------------------------------------
     # Semantic validation (rule‑based)
     # -----------------------------------------------------------------------
-    violations = validators.run_all(netlist)
+    # Slotted Violation records → plain dicts once, for Mongo and the response
+    violations = [v.to_dict() for v in validators.run_all(netlist)]
     status_val = "valid" if not violations else "invalid"
 
+    # Content hash of the canonical (key‑sorted) netlist ⇒ ETag for GETs
+    canonical = orjson.dumps(netlist, option=orjson.OPT_SORT_KEYS)
+    etag = hashlib.sha256(canonical).hexdigest()
+
     # 4) ---------------------------------------------------------------------
     # Persist original JSON + metadata + validation report
     # -----------------------------------------------------------------------
-    coll = get_collection()
+    coll = _ingest_coll()
     doc = {
         "userId": user_id,
-        "createdAt": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "createdAt": datetime.now(timezone.utc),  # native BSON date
         "netlist": netlist,
+        "etag": etag,
         "validation": {
             "status": status_val,
             "violations": violations,
         },
     }
-    result = await coll.insert_one(doc)
+    # Already schema‑ and rule‑validated above ⇒ skip server‑side validation
+    result = await coll.insert_one(doc, bypass_document_validation=True)
 
     # 5) ---------------------------------------------------------------------
     # Respond with a concise summary
     # -----------------------------------------------------------------------
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_201_CREATED,
         content={
             "id": str(result.inserted_id),
@@ -164,13 +252,6 @@ async def upload_netlist(
     )
 
 
-# ─────────────────────────────────────────────────────────────────────────────
-# Dependency that yields the collection instance
-# ─────────────────────────────────────────────────────────────────────────────
-def _coll():
-    return get_collection()
-
-
 # ─────────────────────────────────────────────────────────────────────────────
 # GET /api/netlists  –List submissions (paginated)
 # ─────────────────────────────────────────────────────────────────────────────
@@ -179,7 +260,6 @@ async def list_netlists(
     user_id: str = Depends(get_current_user),
     limit: int = Query(20, ge=1, le=100, description="Max items to return"),
     skip: int = Query(0, ge=0, description="Items to skip (offset)"),
-    coll=Depends(_coll),
 ):
     """
     Return a paginated list of the current user’s submissions.
@@ -190,40 +270,36 @@ async def list_netlists(
 
     and the *legacy* shape where `validation` was just a list of violations.
     """
-    cursor = (
+    coll = _coll()
+
+    query = {"userId": user_id}
+
+    # Page and total count run concurrently: one round trip of latency.
+    # Both are served by the {userId, createdAt desc} index – the page only
+    # fetches skip + limit documents and the count never touches one.
+    docs, total = await asyncio.gather(
         coll.find(
-            {"userId": user_id},
-            {"validation": 1, "createdAt": 1},
+            query,
+            # Only the status is needed – never ship violation lists
+            {"validation.status": 1, "createdAt": 1},
         )
         .sort("createdAt", -1)
         .skip(skip)
         .limit(limit)
+        .to_list(length=limit),
+        coll.count_documents(query),
     )
 
-    items: List[dict] = []
-
-    async for doc in cursor:
-        val: Any = doc.get("validation")
-
-        # --------------------------------------------------------------------
-        # Back‑compat logic that computes a uniform "status" string
-        # --------------------------------------------------------------------
-        if isinstance(val, dict):
-            status_str = val.get("status", "unknown")
-        elif isinstance(val, list):
-            status_str = "invalid" if val else "valid"
-        else:
-            status_str = "unknown"
-
-        items.append(
-            {
-                "id": str(doc["_id"]),
-                "createdAt": doc.get("createdAt", ""),
-                "status": status_str,
-            }
-        )
+    # Single pass over the already‑materialised page
+    items: List[dict] = [
+        {
+            "id": str(doc["_id"]),
+            "createdAt": _iso_utc(doc.get("createdAt")),
+            "status": _list_status(doc.get("validation")),
+        }
+        for doc in docs
+    ]
 
-    total = await coll.count_documents({"userId": user_id})
     return {"total": total, "items": items}
 
 
@@ -233,25 +309,52 @@ async def list_netlists(
 @router.get("/{netlist_id}", summary="Get a single submission")
 async def get_netlist(
     netlist_id: str,
+    request: Request,
+    response: Response,
     user_id: str = Depends(get_current_user),
-    coll=Depends(_coll),
 ):
     """
     Fetch the full netlist document and its validation report, but **only**
     if the submission belongs to the current authenticated user.
+
+    Documents stored with an `etag` answer a matching `If‑None‑Match` with
+    `304 Not Modified` instead of re‑sending the netlist.
     """
 
-    # Early check – ensure the ID can be parsed as an ObjectId
-    try:
-        oid = ObjectId(netlist_id)
-    except Exception:
+    # Early check – ensure the ID can be parsed as an ObjectId (no
+    # exception round‑trip for the garbage IDs scanners like to send)
+    if not ObjectId.is_valid(netlist_id):
         raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid netlist ID format")
+    oid = ObjectId(netlist_id)
 
     # Query by both ID *and* user ID to enforce authorization
-    doc = await coll.find_one({"_id": oid, "userId": user_id})
+    query = {"_id": oid, "userId": user_id}
+    coll = _coll()
+
+    # Conditional GET – submissions are immutable, so the hash stays valid.
+    # Check it against a tiny projection first so a cache hit never loads
+    # the netlist blob.
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        head = await coll.find_one(query, {"etag": 1})
+        if not head:
+            raise HTTPException(
+                status.HTTP_404_NOT_FOUND, "Netlist not found or access denied"
+            )
+        etag = head.get("etag")
+        if _etag_matches(if_none_match, etag):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": f'"{etag}"'} if etag else None,
+            )
+
+    doc = await coll.find_one(query)
     if not doc:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Netlist not found or access denied")
 
+    if doc.get("etag"):
+        response.headers["ETag"] = f'"{doc["etag"]}"'
+
     # Normalise validation shape (dict vs list) into a uniform response
     validation = doc.get("validation")
     if isinstance(validation, dict):
@@ -263,7 +366,7 @@ async def get_netlist(
 
     return {
         "id": netlist_id,
-        "createdAt": doc.get("createdAt", ""),
+        "createdAt": _iso_utc(doc.get("createdAt")),
         "status": status_str,
         "violations": violations,
         "netlist": doc["netlist"],
@@ -2,175 +2,266 @@
 """
 Light‑weight, plug‑and‑play rule engine for PCB‑netlist hygiene checks.
 ────────────────────────────────────────────────────────────────────────
-• Each rule is a plain function:  rule(netlist) -> List[Violation]
-  where a Violation = {"rule", "message", "location", "level"}.
+• The netlist is walked **once** (components, then nets) by `build_index`,
+  which fills the shared look‑up maps and emits the violations that can be
+  spotted during the walk itself.
+• Each rule is a thin function:  rule(netlist, index) -> List[Violation]
+  where a Violation is a slotted record (rule, message, location, level);
+  call `.to_dict()` at the API / storage boundary.
+• Output is bounded: each rule reports at most `MAX_PER_RULE` violations and
+  `run_all` at most `MAX_VIOLATIONS`, each cut marked by one "truncated"
+  warning – a pathological upload cannot allocate without limit.
 • The master runner concatenates the lists; an empty result ⇒ netlist passes.
 • Add / remove rules by editing the `_RULES` list.
 """
 
-from typing import Dict, List
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Set
 
-# Alias that clarifies intent in type hints
-Violation = Dict[str, str]
+# Caps on reported violations (per rule / per netlist)
+MAX_PER_RULE = 100
+MAX_VIOLATIONS = 250
 
 
-# --------------------------------------------------------------------------- 
-# Helper –factory for violation dictionaries
-# --------------------------------------------------------------------------- 
+# ---------------------------------------------------------------------------
+# Violation record –__slots__ keeps each instance far smaller than a dict
+# ---------------------------------------------------------------------------
+@dataclass(slots=True)
+class Violation:
+    rule: str
+    message: str
+    location: str = ""
+    level: str = "error"
+
+    def to_dict(self) -> Dict[str, str]:
+        """
+        Canonical JSON / BSON shape: {"rule", "message", "location", "level"}.
+        """
+        return {
+            "rule": self.rule,
+            "message": self.message,
+            "location": self.location,
+            "level": self.level,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Helper –factory for violation records
+# ---------------------------------------------------------------------------
 def _mk(rule: str, msg: str, loc: str = "", level: str = "error") -> Violation:
     """
     Create a Violation object in the canonical shape.
     """
-    return {"rule": rule, "message": msg, "location": loc, "level": level}
+    return Violation(rule, msg, loc, level)
 
 
-# ───────────────────────── Rule 1 ──────────────────────────
-# Ensure that component, pin and net names are non‑blank
-def check_names_not_blank(netlist: dict) -> List[Violation]:
-    v: List[Violation] = []
+# ---------------------------------------------------------------------------
+# Helper –cap a violation list, marking the cut with a sentinel
+# ---------------------------------------------------------------------------
+def _truncate(v: List[Violation], limit: int) -> List[Violation]:
+    """
+    Keep the first *limit* entries of *v* and, if anything was dropped,
+    append a single "truncated" warning.
+    """
+    if len(v) <= limit:
+        return v
+    return v[:limit] + [
+        _mk(
+            "truncated",
+            f"More than {limit} violations; further violations suppressed",
+            level="warning",
+        )
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Shared index –everything the rules need, built in a single traversal
+# ---------------------------------------------------------------------------
+@dataclass
+class NetlistIndex:
+    """
+    Look‑up maps shared by all rules, computed once per netlist.
+    """
+
+    comp_ids: Set[str] = field(default_factory=set)
+    pins_by_comp: Dict[str, Set[str]] = field(default_factory=dict)
+    gnd_net_ids: Set[str] = field(default_factory=set)
+    gnd_pin_comps: List[str] = field(default_factory=list)
+    connections_by_comp: Dict[str, Set[str]] = field(default_factory=dict)
+
+    # Violations found while walking (per rule, in document order)
+    blank_names: List[Violation] = field(default_factory=list)
+    dangling: List[Violation] = field(default_factory=list)
+
+
+def build_index(netlist: dict) -> NetlistIndex:
+    """
+    Walk components and nets exactly once, building every look‑up map and
+    collecting blank‑name / dangling violations inline.
+
+    Each violation list stops growing one past `MAX_PER_RULE` (enough for
+    `_truncate` to notice); the walk itself always completes because the
+    look‑up maps must cover the whole netlist.
+    """
+
+    index = NetlistIndex()
+    blank_names = index.blank_names
+    dangling = index.dangling
 
+    # --------------------------------------------------------------------
+    # Pass 1 – components (+ their pins)
+    # --------------------------------------------------------------------
     for comp in netlist["components"]:
-        if not comp["name"].strip():
-            v.append(
-                _mk(
-                    "non_blank_names",
-                    "Component name blank",
-                    f"component:{comp['id']}",
-                )
+        cid = comp["id"]
+        index.comp_ids.add(cid)
+
+        if not comp["name"].strip() and len(blank_names) <= MAX_PER_RULE:
+            blank_names.append(
+                _mk("non_blank_names", "Component name blank", f"component:{cid}")
             )
 
+        pin_ids = set()
+        has_gnd_pin = False
         for pin in comp["pins"]:
-            if not pin["name"].strip():
-                v.append(
+            pin_ids.add(pin["id"])
+            pin_name = pin["name"]
+            if not has_gnd_pin and pin_name.upper() == "GND":
+                has_gnd_pin = True
+            if not pin_name.strip() and len(blank_names) <= MAX_PER_RULE:
+                blank_names.append(
                     _mk(
                         "non_blank_names",
                         "Pin name blank",
-                        f"component:{comp['id']}.pin:{pin['id']}",
+                        f"component:{cid}.pin:{pin['id']}",
                     )
                 )
+        index.pins_by_comp[cid] = pin_ids
+
+        # Non‑connector parts that declare a pin named “GND” (for Rule 2)
+        if has_gnd_pin and comp["type"].lower() != "connector":
+            index.gnd_pin_comps.append(cid)
+
+    # --------------------------------------------------------------------
+    # Pass 2 – nets (+ their connections)
+    # --------------------------------------------------------------------
+    comp_ids = index.comp_ids
+    pins_by_comp = index.pins_by_comp
+    connections_by_comp = index.connections_by_comp
 
     for net in netlist["nets"]:
-        if not net["name"].strip():
-            v.append(
+        nid, net_name = net["id"], net["name"]
+
+        if not net_name.strip() and len(blank_names) <= MAX_PER_RULE:
+            blank_names.append(_mk("non_blank_names", "Net name blank", f"net:{nid}"))
+
+        if net_name.upper() == "GND":
+            index.gnd_net_ids.add(nid)
+
+        for idx, conn in enumerate(net["connections"]):
+            cid, pid = conn["componentId"], conn["pinId"]
+            connections_by_comp.setdefault(cid, set()).add(nid)
+
+            if cid not in comp_ids:
+                if len(dangling) <= MAX_PER_RULE:
+                    dangling.append(
+                        _mk(
+                            "dangling_connection",
+                            f"Net references unknown component '{cid}'",
+                            f"net:{nid}[{idx}]",
+                        )
+                    )
+            elif pid not in pins_by_comp[cid] and len(dangling) <= MAX_PER_RULE:
+                dangling.append(
+                    _mk(
+                        "dangling_connection",
+                        f"Net references unknown pin '{cid}.{pid}'",
+                        f"net:{nid}[{idx}]",
+                    )
+                )
+
+        # Net is useless if it only touches one pin
+        if len(net["connections"]) < 2 and len(dangling) <= MAX_PER_RULE:
+            dangling.append(
                 _mk(
-                    "non_blank_names",
-                    "Net name blank",
-                    f"net:{net['id']}",
+                    "dangling_net",
+                    "Net has <2 connections (dangling)",
+                    f"net:{nid}",
                 )
             )
 
-    return v
+    return index
+
+
+# ───────────────────────── Rule 1 ──────────────────────────
+# Ensure that component, pin and net names are non‑blank
+def check_names_not_blank(netlist: dict, index: NetlistIndex) -> List[Violation]:
+    return _truncate(index.blank_names, MAX_PER_RULE)
 
 
 # ───────────────────────── Rule 2 ──────────────────────────
 # Components that declare a GND pin must actually connect to a GND net
-def check_gnd_connections(netlist: dict) -> List[Violation]:
+def check_gnd_connections(netlist: dict, index: NetlistIndex) -> List[Violation]:
     v: List[Violation] = []
 
-    # Gather all nets explicitly named “GND”
-    gnd_nets = [n for n in netlist["nets"] if n["name"].upper() == "GND"]
-    if not gnd_nets:
+    # No net explicitly named “GND” at all
+    gnd_net_ids = index.gnd_net_ids
+    if not gnd_net_ids:
         return [_mk("gnd_present", "Net named 'GND' missing")]
 
-    gnd_net_ids = {n["id"] for n in gnd_nets}
-
-    # Build a map: component_id → set(net_ids) for quick look‑ups
-    connections_by_comp = {}
-    for net in netlist["nets"]:
-        for conn in net["connections"]:
-            connections_by_comp.setdefault(conn["componentId"], set()).add(net["id"])
-
-    for comp in netlist["components"]:
-        # Skip connectors entirely
-        if comp["type"].lower() == "connector":
-            continue
+    connections_by_comp = index.connections_by_comp
 
-        # Only enforce rule if the part declares a pin named “GND”
-        has_gnd_pin = any(p["name"].upper() == "GND" for p in comp["pins"])
-        if not has_gnd_pin:
-            continue
+    # Only parts that declare a GND pin (connectors already skipped)
+    for cid in index.gnd_pin_comps:
+        # Budget exhausted – one extra entry lets _truncate flag the cut
+        if len(v) > MAX_PER_RULE:
+            break
 
         # None of the nets tied to this component are GND ⇒ violation
-        if not (connections_by_comp.get(comp["id"], set()) & gnd_net_ids):
+        if gnd_net_ids.isdisjoint(connections_by_comp.get(cid, ())):
             v.append(
                 _mk(
                     "gnd_connected",
                     "Component declares a GND pin but it is unconnected",
-                    f"component:{comp['id']}",
+                    f"component:{cid}",
                 )
             )
-    return v
+    return _truncate(v, MAX_PER_RULE)
 
 
 # ───────────────────────── Rule 3 ──────────────────────────
 # Detect dangling nets and orphan references
-def check_dangling(netlist: dict) -> List[Violation]:
-    v: List[Violation] = []
-
-    # Pre‑compute quick‑look‑up sets
-    comp_ids = {c["id"] for c in netlist["components"]}
-    pins_by_comp = {
-        c["id"]: {p["id"] for p in c["pins"]} for c in netlist["components"]
-    }
-
-    for net in netlist["nets"]:
-        # --------------------------------------------------------------------
-        # Validate every connection tuple
-        # --------------------------------------------------------------------
-        for idx, conn in enumerate(net["connections"]):
-            cid, pid = conn["componentId"], conn["pinId"]
-
-            if cid not in comp_ids:
-                v.append(
-                    _mk(
-                        "dangling_connection",
-                        f"Net references unknown component '{cid}'",
-                        f"net:{net['id']}[{idx}]",
-                    )
-                )
-            elif pid not in pins_by_comp[cid]:
-                v.append(
-                    _mk(
-                        "dangling_connection",
-                        f"Net references unknown pin '{cid}.{pid}'",
-                        f"net:{net['id']}[{idx}]",
-                    )
-                )
-
-        # --------------------------------------------------------------------
-        # Net is useless if it only touches one pin
-        # --------------------------------------------------------------------
-        if len(net["connections"]) < 2:
-            v.append(
-                _mk(
-                    "dangling_net",
-                    "Net has <2 connections (dangling)",
-                    f"net:{net['id']}",
-                )
-            )
-    return v
+def check_dangling(netlist: dict, index: NetlistIndex) -> List[Violation]:
+    return _truncate(index.dangling, MAX_PER_RULE)
 
 
-# --------------------------------------------------------------------------- 
+# ---------------------------------------------------------------------------
 # Rule registry –add/remove functions to change policy
-# --------------------------------------------------------------------------- 
-_RULES = [
+# ---------------------------------------------------------------------------
+Rule = Callable[[dict, NetlistIndex], List[Violation]]
+
+_RULES: List[Rule] = [
     check_names_not_blank,
     check_gnd_connections,
     check_dangling,
 ]
 
 
-# --------------------------------------------------------------------------- 
+# ---------------------------------------------------------------------------
 # Runner –execute all rules and concatenate results
-# --------------------------------------------------------------------------- 
+# ---------------------------------------------------------------------------
 def run_all(netlist: dict) -> List[Violation]:
     """
     Execute all registered rules and return a **flat list** of violations.
     An empty list ⇒ the netlist is considered valid.
+
+    At most `MAX_VIOLATIONS` entries (plus one "truncated" marker) are kept.
     """
 
+    index = build_index(netlist)
+
     violations: List[Violation] = []
     for rule in _RULES:
-        violations.extend(rule(netlist))
+        violations.extend(rule(netlist, index))
+        if len(violations) > MAX_VIOLATIONS:
+            return _truncate(violations, MAX_VIOLATIONS)
     return violations
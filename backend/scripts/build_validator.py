@@ -0,0 +1,58 @@
+"""
+backend/scripts/build_validator.py
+──────────────────────────────────────────────────────────────────────────────
+Build step that turns `schema/netlist.schema.jsonc` into plain Python source.
+
+fastjsonschema can emit the validator it would otherwise build in memory.
+Writing that code to `app/_netlist_validator.py` means the API process only
+*imports* a module at startup – no JSONC parsing, no code generation.
+
+Usage (from the `backend/` directory):
+
+    python scripts/build_validator.py
+
+Re‑run whenever the schema file changes.
+"""
+
+# Standard library / third‑party imports
+import pathlib
+import sys
+
+import fastjsonschema
+
+# Make the `app` package importable when run as a plain script
+BACKEND_DIR = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.jsonc_loader import load_jsonc  # noqa: E402
+
+
+# ---------------------------------------------------------------------------
+# Input / output locations
+# ---------------------------------------------------------------------------
+SCHEMA_PATH = BACKEND_DIR / "schema" / "netlist.schema.jsonc"
+OUTPUT_PATH = BACKEND_DIR / "app" / "_netlist_validator.py"
+
+HEADER = (
+    "# backend/app/_netlist_validator.py\n"
+    "# AUTO‑GENERATED by scripts/build_validator.py from "
+    "schema/netlist.schema.jsonc – do not edit by hand.\n"
+    "# fmt: off\n"
+)
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+def main() -> None:
+    """
+    Compile the schema to source code and write it next to the app modules.
+    """
+
+    code = fastjsonschema.compile_to_code(load_jsonc(SCHEMA_PATH))
+    OUTPUT_PATH.write_text(HEADER + code.rstrip("\n") + "\n", encoding="utf-8")
+    print(f"Wrote {OUTPUT_PATH.relative_to(BACKEND_DIR)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,7 @@
 
 db = db.getSiblingDB('pcb');
 
-const now = new Date().toISOString();
+const now = new Date();  // stored as a BSON date, like the API does
 
 db.netlists.insertOne({
   userId: 'demo@example.com',